@@ -1,7 +1,12 @@
+import concurrent.futures
 import http.server
-import socketserver
+import multiprocessing
 import os
+import signal
 import sys
+import threading
+from typing import BinaryIO
+from concurrent.futures.process import BrokenProcessPool
 
 # Add project directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -10,25 +15,108 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from utils import process_leaderboards
 
 PORT = 8000
+LEADERBOARD_PATH = '/data/leaderboard.json'
+
+_lock = threading.Lock()
+# Single worker process for rebuilds, created in main()
+_executor = None
+_future = None
+
+def _ignore_sigint() -> None:
+    """
+    Worker initializer: Ctrl+C reaches the whole process group, but only the server
+    should handle it; it shuts the pool down on exit.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _new_executor() -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Single-worker process pool for rebuilds, so they never hold up request threads.
+    Spawn rather than fork, since forking a threaded server is unsafe.
+    """
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_ignore_sigint,
+    )
+
+def _on_refresh_done(future: concurrent.futures.Future) -> None:
+    """Report a failed background rebuild."""
+    error = future.exception()
+    if error is not None:
+        print(f"Leaderboard processing failed: {error}")
+
+def refresh_leaderboard() -> None:
+    """
+    Submit a rebuild to the worker process if the leaderboard JSON is stale.
+    Never blocks: callers keep serving the JSON currently on disk.
+    """
+    global _executor, _future
+    if process_leaderboards.is_up_to_date():
+        return
+
+    with _lock:
+        if _future is not None and not _future.done():
+            return
+        try:
+            _future = _executor.submit(process_leaderboards.main)
+        except BrokenProcessPool:
+            # The worker died (OOM kill, crash, ...); replace the pool and retry once
+            print("Leaderboard worker process died, starting a new one.")
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = _new_executor()
+            _future = _executor.submit(process_leaderboards.main)
+        _future.add_done_callback(_on_refresh_done)
 
 class StaticHandler(http.server.SimpleHTTPRequestHandler):
-    """Serves pre-computed static files. Leaderboard data is generated once at startup."""
+    """
+    Serves static files. Requests for the leaderboard JSON get the file currently
+    on disk and trigger a background rebuild when its inputs have changed.
+    """
+
+    # Keep connections alive so a page load reuses one socket for all its assets.
+    # Every response must therefore carry a Content-Length.
+    protocol_version = 'HTTP/1.1'
+    # Close idle keep-alive connections so they do not each pin a server thread
+    timeout = 30
     
     def do_GET(self):
         if self.path == '/':
-            self.send_response(301)
-            self.send_header('Location', '/index.html')
-            self.end_headers()
+            self.redirect('/index.html')
             return
         elif self.path.startswith('/docs/'):
-            self.send_response(301)
-            self.send_header('Location', self.path[len('/docs'):])
-            self.end_headers()
+            self.redirect(self.path[len('/docs'):])
             return
 
+        if self.path.split('?', 1)[0] == LEADERBOARD_PATH:
+            # Whatever goes wrong, still serve the JSON currently on disk
+            try:
+                refresh_leaderboard()
+            except Exception as e:
+                print(f"Leaderboard refresh failed: {e}")
+
         super().do_GET()
 
+    def redirect(self, location: str) -> None:
+        """Send an empty 301 response pointing at `location`."""
+        self.send_response(301)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def copyfile(self, source: BinaryIO, outputfile: BinaryIO) -> None:
+        """
+        Stream the response body with sendfile(2) instead of copying it through
+        userspace. socket.sendfile() falls back to a send() loop on its own when
+        the source is not a regular file, e.g. the BytesIO of a directory listing.
+        """
+        if outputfile is not self.wfile:
+            super().copyfile(source, outputfile)
+            return
+        self.connection.sendfile(source)
+
 def main():
+    global _executor
     project_root = os.path.dirname(os.path.abspath(__file__))
     docs_dir = os.path.join(project_root, 'docs')
     os.chdir(docs_dir)
@@ -40,20 +128,22 @@ def main():
     except Exception as e:
         print(f"Initial processing failed: {e}")
 
+    # Later rebuilds run in a separate worker process
+    _executor = _new_executor()
+
     # Set up the server
     handler = StaticHandler
 
-    # Allow address reuse to avoid "Address already in use" errors during quick restarts
-    socketserver.TCPServer.allow_reuse_address = True
-
-    with socketserver.TCPServer(("", PORT), handler) as httpd:
+    with http.server.ThreadingHTTPServer(("", PORT), handler) as httpd:
         print(f"\nServing at http://localhost:{PORT}")
-        print("Serving pre-computed static files.")
+        print("Leaderboard data is rebuilt in the background when its inputs change.")
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\nShutting down server.")
             httpd.shutdown()
+        finally:
+            _executor.shutdown(wait=False, cancel_futures=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Write to a uniquely named sibling file and swap it in, so readers never see a
+    partial file and concurrent writers (CLI and server worker) never share one.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+
+    f = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path),
+        prefix=os.path.basename(path) + '.',
+        suffix='.tmp',
+        delete=False,
+    )
+    try:
+        # Close before chmod/replace/unlink: Windows cannot do those on an open file
+        with f:
+            f.write(data)
+        # Temp files are created 0600; keep the target readable as before
+        os.chmod(f.name, mode)
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
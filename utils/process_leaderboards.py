@@ -1,23 +1,40 @@
+import functools
 import os
 import json
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+if __package__:
+    from .fileio import write_atomic
+else:  # Run as a script: utils/ itself is on sys.path
+    from fileio import write_atomic
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see dump_json
+    orjson = None
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, 'docs', 'data', 'leaderboards')
 OUTPUT_FILE = os.path.join(BASE_DIR, 'docs', 'data', 'leaderboard.json')
 CONFIG_FILE = os.path.join(BASE_DIR, 'docs', 'data', 'config.json')
+# Per-game results of the previous run, so unchanged scoreboards are not reparsed
+STATE_FILE = os.path.join(BASE_DIR, 'docs', 'data', '.leaderboard_state.json')
+
+_FP8_RE = re.compile(r'-fp8(?:-speedy)?')
+_SUFFIX_RE = re.compile(r':[12]$')
+# Column separator including surrounding whitespace, so one split also strips fields
+_FIELD_SEP_RE = re.compile(r'\s*\|\s*')
 
 def clean_model_name(agent_name):
     """
     Clean model name by removing fp8 variants and agent suffixes.
     Replicates: modelName.replace(/-fp8-speedy/g, '').replace(/-fp8/g, '').replace(/:1$|:2$/, '')
     """
-    name = agent_name
-    name = name.replace('-fp8-speedy', '')
-    name = name.replace('-fp8', '')
-    name = re.sub(r':1$|:2$', '', name)
-    return name
+    return _SUFFIX_RE.sub('', _FP8_RE.sub('', agent_name))
 
 def load_config() -> tuple[dict[str, str], dict[str, int]]:
     """
@@ -25,7 +42,13 @@ def load_config() -> tuple[dict[str, str], dict[str, int]]:
     Returns (game_mapping, weights):
         game_mapping: {code -> game_id}, e.g. {'A1': 'game1'}
         weights:      {game_id -> weight}, e.g. {'game1': 5}
+    The parsed result is cached until the file's mtime changes; treat it as read-only.
     """
+    return _load_config_cached(os.path.getmtime(CONFIG_FILE))
+
+@functools.lru_cache(maxsize=1)
+def _load_config_cached(mtime: float) -> tuple[dict[str, str], dict[str, int]]:
+    """Parse the config file. `mtime` only serves as the cache key."""
     with open(CONFIG_FILE, 'r') as f:
         config = json.load(f)
 
@@ -37,26 +60,30 @@ def parse_leaderboard_file(filepath):
     """
     Parses a single leaderboard txt file.
     Format: Agent | Games | Wins | Losses | Draws | Points | Score
+    Returns an empty list if the file does not exist; callers report that, since
+    this runs on worker threads.
     """
     entries = []
-    if not os.path.exists(filepath):
-        print(f"Warning: {filepath} not found.")
+    try:
+        with open(filepath, 'rb') as f:
+            # Hint a front-to-back read so cold-cache runs get full readahead
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            lines = f.read().decode().splitlines()
+    except FileNotFoundError:
         return entries
 
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-
     is_a3 = "A3-scoreboard.txt" in os.path.basename(filepath)
+    expected_len = 10 if is_a3 else 7
 
     for line in lines:
         trimmed = line.strip()
         if not trimmed:
             continue
         
-        parts = [p.strip() for p in trimmed.split('|')]
+        parts = _FIELD_SEP_RE.split(trimmed)
         
         # Skip header or malformed lines
-        expected_len = 10 if is_a3 else 7
         if len(parts) < expected_len:
             continue
         if 'Agent' in parts[0]:
@@ -99,98 +126,144 @@ def parse_leaderboard_file(filepath):
 def select_best_agents(entries):
     """
     Selects the best performing agent for each model.
+    Entries are annotated with their model name in place; they are freshly parsed,
+    so there is no need to copy them.
     """
     model_best = {}
     
     for entry in entries:
         model_name = clean_model_name(entry['agent'])
+        entry['model'] = model_name
         
         # If model not seen or this entry has higher score, update
-        current_score = entry['score']
-        
-        if model_name not in model_best:
-            best_entry = entry.copy()
-            best_entry['model'] = model_name
-            model_best[model_name] = best_entry
-        else:
-            if current_score > model_best[model_name]['score']:
-                best_entry = entry.copy()
-                best_entry['model'] = model_name
-                model_best[model_name] = best_entry
+        current_best = model_best.get(model_name)
+        if current_best is None or entry['score'] > current_best['score']:
+            model_best[model_name] = entry
             
     return list(model_best.values())
 
 def normalize_points(entries, game_code):
     """
     Normalize points based on theoretical maximum possible points.
+    Entries are annotated in place and returned.
     """
-    if not entries:
-        return []
-    
-    normalized_entries = []
+    # Wizard (A3) awards up to 5 points per game, every other game up to 3
+    points_per_game = 5 if game_code == 'A3' else 3
+
     for entry in entries:
-        new_entry = entry.copy()
-        total_games = entry.get('games', 0)
-        
-        if total_games == 0:
-            new_entry['normalized'] = 0.0
+        max_possible = entry.get('games', 0) * points_per_game
+        if max_possible > 0:
+            entry['normalized'] = (entry['points'] / max_possible) * 100.0
         else:
-            if game_code == 'A3':
-                max_possible = total_games * 5
-            else:
-                max_possible = total_games * 3
-                
-            if max_possible > 0:
-                new_entry['normalized'] = (entry['points'] / max_possible) * 100.0
-            else:
-                new_entry['normalized'] = 0.0
-                
-        normalized_entries.append(new_entry)
+            entry['normalized'] = 0.0
         
-    return normalized_entries
+    return entries
+
+def rank_agents(entries: list[dict], game_code: str) -> list[dict]:
+    """
+    Select the best agent per model, normalize its points and sort descending.
+    Only the per-model winners are normalized, and no entry is copied.
+    """
+    best_agents = normalize_points(select_best_agents(entries), game_code)
+    best_agents.sort(key=itemgetter('normalized'), reverse=True)
+    return best_agents
 
 def calculate_overall(game_data, weights):
     """
     Calculate weighted overall points.
     """
+    # model -> [weighted_sum, total_weight, game_scores]
     model_scores = {}
-    # game_ids needs to cover all potential games
-    game_ids = ['game1', 'game2', 'game3', 'game4', 'game5', 'game6', 'game7', 'game8']
     
     # We iterate through the processed game data
     for game_id, entries in game_data.items():
         weight = weights.get(game_id, 1) # Default weight 1 if missing for some reason
         
         for entry in entries:
-            model = entry['model']
-            if model not in model_scores:
-                model_scores[model] = {
-                    'model': model,
-                    'weighted_sum': 0.0,
-                    'total_weight': 0.0,
-                    'game_scores': {}
-                }
-            
             # Using normalized score
-            model_scores[model]['weighted_sum'] += entry['normalized'] * weight
-            model_scores[model]['total_weight'] += weight
-            model_scores[model]['game_scores'][game_id] = entry['normalized']
-            
-    results = []
-    for m, data in model_scores.items():
-        avg_score = 0
-        if data['total_weight'] > 0:
-            avg_score = data['weighted_sum'] / data['total_weight']
+            normalized = entry['normalized']
+            acc = model_scores.get(entry['model'])
+            if acc is None:
+                acc = model_scores[entry['model']] = [0.0, 0.0, {}]
+            acc[0] += normalized * weight
+            acc[1] += weight
+            acc[2][game_id] = normalized
             
-        results.append({
-            'model': m,
-            'overall_score': avg_score,
-            'game_scores': data['game_scores']
-        })
+    results = [
+        {
+            'model': model,
+            'overall_score': weighted_sum / total_weight if total_weight > 0 else 0,
+            'game_scores': game_scores
+        }
+        for model, (weighted_sum, total_weight, game_scores) in model_scores.items()
+    ]
         
-    return sorted(results, key=lambda x: x['overall_score'], reverse=True)
+    return sorted(results, key=itemgetter('overall_score'), reverse=True)
+
+def dump_json(data: dict) -> bytes:
+    """
+    Serialize data as 2-space indented JSON.
+    Uses orjson when installed: the stdlib encoder drops to pure Python with indent.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+def is_up_to_date() -> bool:
+    """
+    True if OUTPUT_FILE is newer than this module, the config, the scoreboard
+    directory and every file in it. The module's mtime covers edits to the processing
+    code and the directory's own mtime covers deleted or renamed files; ties count
+    as stale because filesystem timestamps are coarse.
+    """
+    try:
+        out_mtime = os.path.getmtime(OUTPUT_FILE)
+        in_mtime = max(
+            os.path.getmtime(__file__),
+            os.path.getmtime(CONFIG_FILE),
+            os.path.getmtime(DATA_DIR),
+        )
+        with os.scandir(DATA_DIR) as entries:
+            for entry in entries:
+                in_mtime = max(in_mtime, entry.stat().st_mtime)
+    except FileNotFoundError:
+        return False
+    return out_mtime > in_mtime
+
+def process_game(code: str) -> list[dict]:
+    """
+    Parse one game's scoreboard and return its best agent per model, normalized
+    and sorted descending. Returns an empty list if the scoreboard has no entries.
+    Runs on worker threads, so it does not print.
+    """
+    path = os.path.join(DATA_DIR, f"{code}-scoreboard.txt")
+    return rank_agents(parse_leaderboard_file(path), code)
+
+def code_fingerprint() -> int:
+    """mtime of this module, so edits to the processing code invalidate the cache."""
+    return os.stat(__file__).st_mtime_ns
+
+def load_state() -> dict:
+    """
+    Load the per-game cache written by the previous run:
+    {game_id: {'code': ..., 'mtime': st_mtime_ns, 'size': st_size, 'entries': [...]}}
+    Returns {} if the file is missing, malformed or written by other processing code.
+    """
+    try:
+        with open(STATE_FILE, 'rb') as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get('code') != code_fingerprint():
+        return {}
+    games = state.get('games')
+    return games if isinstance(games, dict) else {}
+
+def main(force: bool = False) -> None:
+    if not force and is_up_to_date():
+        print(f"{OUTPUT_FILE} is up-to-date.")
+        return
 
-def main():
     print("Loading config...")
     game_mapping, weights = load_config()
     print(f"Games: {game_mapping}")
@@ -201,34 +274,57 @@ def main():
         "overall": []
     }
 
-    # Temporary storage for calculation
-    game_best_normalized = {}
+    # --force also ignores the per-game cache
+    state = {} if force else load_state()
+    new_state = {}
+    stale_games = {}
 
-    # Iterate through games defined in config
     for code, game_id in game_mapping.items():
-        filename = f"{code}-scoreboard.txt"
-        path = os.path.join(DATA_DIR, filename)
-        
-        print(f"Processing {game_id} ({filename})...")
-        raw_entries = parse_leaderboard_file(path)
-        
-        if not raw_entries:
-            print(f"  No entries found for {game_id}")
-            processed_data["games"][game_id] = []
-            continue
-            
-        # Select best agent per model
-        best_agents = select_best_agents(raw_entries)
-        
-        # Normalize
-        normalized_agents = normalize_points(best_agents, code)
-        
-        # Sort descending by normalized score
-        normalized_agents.sort(key=lambda x: x['normalized'], reverse=True)
-        
-        # Store
-        processed_data["games"][game_id] = normalized_agents
-        game_best_normalized[game_id] = normalized_agents
+        path = os.path.join(DATA_DIR, f"{code}-scoreboard.txt")
+        try:
+            st = os.stat(path)
+            mtime, size = st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            mtime = size = None
+
+        cached = state.get(game_id) or {}
+        is_fresh = (
+            mtime is not None
+            and cached.get('code') == code
+            and cached.get('mtime') == mtime
+            and cached.get('size') == size
+            and 'entries' in cached
+        )
+        if is_fresh:
+            print(f"Reusing {game_id} ({code}-scoreboard.txt unchanged)")
+            processed_data["games"][game_id] = cached['entries']
+        else:
+            print(f"Processing {game_id} ({code}-scoreboard.txt)...")
+            if mtime is None:
+                print(f"Warning: {path} not found.")
+            # Placeholder keeps the games in config order
+            processed_data["games"][game_id] = None
+            stale_games[code] = game_id
+        new_state[game_id] = {'code': code, 'mtime': mtime, 'size': size}
+
+    # Games are independent file reads + parses, so process them concurrently;
+    # map() keeps the results in submission order
+    with ThreadPoolExecutor(max_workers=len(stale_games) or 1) as executor:
+        results = executor.map(process_game, stale_games.keys())
+        for game_id, normalized_agents in zip(stale_games.values(), results):
+            if not normalized_agents:
+                print(f"  No entries found for {game_id}")
+            processed_data["games"][game_id] = normalized_agents
+
+    for game_id, entries in processed_data["games"].items():
+        new_state[game_id]['entries'] = entries
+
+    # Temporary storage for calculation
+    game_best_normalized = {
+        game_id: entries
+        for game_id, entries in processed_data["games"].items()
+        if entries
+    }
         
     # Calculate overall
     print("Calculating overall points...")
@@ -237,10 +333,12 @@ def main():
     
     # Write output
     print(f"Writing parsed data to {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(processed_data, f, indent=2)
+    write_atomic(OUTPUT_FILE, dump_json(processed_data))
+    write_atomic(
+        STATE_FILE, dump_json({'code': code_fingerprint(), 'games': new_state})
+    )
         
     print("Done.")
 
 if __name__ == "__main__":
-    main()
+    main(force='--force' in sys.argv[1:])
@@ -1,7 +1,12 @@
 import os
 import json
 import re
-from datetime import datetime
+import time
+
+if __package__:
+    from .fileio import write_atomic
+else:  # Run as a script: utils/ itself is on sys.path
+    from fileio import write_atomic
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -43,9 +48,9 @@ def main():
             
     if latest_files:
         # Get modification time of one of the files for the date
-        first_file = list(latest_files.values())[0]
+        first_file = next(iter(latest_files.values()))
         timestamp = os.path.getmtime(os.path.join(RUNS_DIR, first_file))
-        date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+        date_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
         
         runs.append({
             "name": "Latest Results",
@@ -66,9 +71,8 @@ def main():
         if 'timestamp' in r:
             del r['timestamp']
 
-    # Write to JSON
-    with open(MANIFEST_FILE, 'w') as f:
-        json.dump({"runs": runs}, f, indent=2)
+    # Write to JSON without the frontend ever fetching a partial file
+    write_atomic(MANIFEST_FILE, json.dumps({"runs": runs}, indent=2).encode())
     
     print(f"\nSuccessfully updated {MANIFEST_FILE} with {len(runs)} runs.")
 